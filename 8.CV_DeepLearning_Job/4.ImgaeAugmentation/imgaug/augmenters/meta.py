@@ -2026,7 +2026,8 @@ class Augmenter(object):
         """Alias for :func:`~imgaug.augmenters.meta.Augmenter.augment`."""
         return self.augment(*args, **kwargs)
 
-    def pool(self, processes=None, maxtasksperchild=None, seed=None):
+    def pool(self, processes=None, maxtasksperchild=None, seed=None,
+             use_shared_memory=False):
         """Create a pool used for multicore augmentation.
 
         Parameters
@@ -2051,6 +2052,14 @@ class Augmenter(object):
             The seed to use for child processes. If ``None``, a random seed
             will be used.
 
+        use_shared_memory : bool, optional
+            Same as for :func:`~imgaug.multicore.Pool.__init__`.
+            Whether to transfer image, heatmap and segmentation map arrays
+            to and from the workers via shared memory instead of pickling
+            them.
+
+            Added in 0.5.0.
+
         Returns
         -------
         imgaug.multicore.Pool
@@ -2099,7 +2108,8 @@ class Augmenter(object):
         """
         import imgaug.multicore as multicore
         return multicore.Pool(self, processes=processes,
-                              maxtasksperchild=maxtasksperchild, seed=seed)
+                              maxtasksperchild=maxtasksperchild, seed=seed,
+                              use_shared_memory=use_shared_memory)
 
     # TODO most of the code of this function could be replaced with
     #      ia.draw_grid()
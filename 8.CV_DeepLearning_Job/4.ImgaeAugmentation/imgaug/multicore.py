@@ -1,19 +1,34 @@
 """Classes and functions dealing with augmentation on multiple CPU cores."""
 from __future__ import print_function, division, absolute_import
+import os
 import sys
+import copy as copy_module
+import collections
 import multiprocessing
 import threading
 import traceback
 import time
 import random
 import platform
+import uuid
 
 import numpy as np
 import cv2
 
 import imgaug.imgaug as ia
 import imgaug.random as iarandom
-from imgaug.augmentables.batches import Batch, UnnormalizedBatch
+from imgaug.augmentables.batches import (Batch, UnnormalizedBatch,
+                                         _AUGMENTABLE_NAMES)
+from imgaug.augmentables.heatmaps import HeatmapsOnImage
+from imgaug.augmentables.segmaps import SegmentationMapsOnImage
+
+# shared_memory is only available in python 3.8+
+try:
+    from multiprocessing import resource_tracker as _resource_tracker
+    from multiprocessing import shared_memory as _shared_memory
+except ImportError:
+    _resource_tracker = None
+    _shared_memory = None
 
 if sys.version_info[0] == 2:
     # pylint: disable=redefined-builtin, import-error
@@ -129,6 +144,30 @@ class Pool(object):
         The seed to use for child processes. If ``None``, a random seed will
         be used.
 
+    use_shared_memory : bool, optional
+        Whether to transfer image, heatmap and segmentation map arrays
+        between the main process and the workers via shared memory instead
+        of pickling them. If ``True``, the arrays of each batch are copied
+        into a ring of reusable ``multiprocessing.shared_memory`` blocks and
+        only lightweight descriptors of them are sent to the workers. The
+        workers send their results back in the same way. The ``*_unaug``
+        attributes of the returned batches are then the ones of the input
+        batches (not copies). This decreases the transfer overhead for large
+        images, while it does not change the augmentation results.
+        Requires python 3.8 or later.
+
+        Note that the shared memory blocks are allocated in ``/dev/shm`` on
+        most unix systems, which may be small (e.g. 64MB in docker
+        containers by default). To limit the amount of shared memory in
+        use, at most ``2*P`` batches (with ``P`` being the number of
+        processes) are in flight at the same time in ``map_batches()``,
+        ``map_batches_async()`` and -- unless `output_buffer_size` is
+        set -- ``imap_batches()`` and ``imap_batches_unordered()``.
+        Each of these batches requires roughly the size of its arrays plus
+        the size of its augmented arrays in ``/dev/shm``.
+
+        Added in 0.5.0.
+
     """
     # This attribute saves the augmentation sequence for background workers so
     # that it does not have to be resend with every batch. The attribute is set
@@ -145,7 +184,7 @@ class Pool(object):
     _WORKER_SEED_START = None
 
     def __init__(self, augseq, processes=None, maxtasksperchild=None,
-                 seed=None):
+                 seed=None, use_shared_memory=False):
         # make sure that don't call pool again in a child process
         assert Pool._WORKER_AUGSEQ is None, (
             "_WORKER_AUGSEQ was already set when calling Pool.__init__(). "
@@ -174,9 +213,27 @@ class Pool(object):
             )
         self.seed = seed
 
+        assert not use_shared_memory or _shared_memory is not None, (
+            "Expected `use_shared_memory` to be `False` as shared memory "
+            "is only supported in python 3.8 or later.")
+        self.use_shared_memory = use_shared_memory
+
         # multiprocessing.Pool instance
         self._pool = None
 
+        # _SharedMemoryRing instance, only used if use_shared_memory is True
+        self._shm_ring = None
+
+        # Maps batch ids to (batch, shared memory block) for batches that
+        # were sent to the workers via shared memory, but whose results were
+        # not yet received.
+        self._shm_pending = {}
+
+        # Prefix of the names of shared memory blocks that workers create for
+        # their results. The names are derived from the batch ids, so that
+        # blocks of results that were never received can be unlinked later.
+        self._shm_result_prefix = "iaa%s" % (uuid.uuid4().hex[0:8],)
+
         # Running counter of the number of augmented batches. This will be
         # used to send indexes for each batch to the workers so that they can
         # augment using SEED_BASE+SEED_BATCH and ensure consistency of applied
@@ -223,11 +280,23 @@ class Pool(object):
                         "intended.")
                     processes = None
 
+            if self.use_shared_memory:
+                # Workers have to share the main process' resource tracker.
+                # Otherwise they would each start their own one, which would
+                # then complain about blocks that are unlinked by the main
+                # process.
+                _resource_tracker.ensure_running()
+
             self._pool = _get_context().Pool(
                 processes,
                 initializer=_Pool_initialize_worker,
                 initargs=(self.augseq, self.seed),
                 maxtasksperchild=self.maxtasksperchild)
+
+            if self.use_shared_memory:
+                # pylint: disable=protected-access
+                self._shm_ring = _SharedMemoryRing(
+                    nb_slabs=2 * self._pool._processes)
         return self._pool
 
     def map_batches(self, batches, chunksize=None):
@@ -250,6 +319,9 @@ class Pool(object):
 
         """
         self._assert_batches_is_list(batches)
+        if self.use_shared_memory:
+            return self._map_batches_shm(self._handle_batch_ids(batches),
+                                         chunksize)
         return self.pool.map(
             _Pool_starworker,
             self._handle_batch_ids(batches),
@@ -279,15 +351,70 @@ class Pool(object):
         -------
         multiprocessing.MapResult
             Asynchonous result. See ``multiprocessing.Pool``.
+            If `use_shared_memory` was activated, an object with the same
+            methods as ``multiprocessing.MapResult`` is returned instead.
 
         """
         self._assert_batches_is_list(batches)
-        return self.pool.map_async(
+        if not self.use_shared_memory:
+            return self.pool.map_async(
+                _Pool_starworker,
+                self._handle_batch_ids(batches),
+                chunksize=chunksize,
+                callback=callback,
+                error_callback=error_callback)
+
+        # The number of batches in flight is limited in shared memory mode,
+        # hence sending and receiving has to happen in a separate thread.
+        _ = self.pool  # create the pool in the calling thread
+        result = _SharedMemoryMapResult(callback, error_callback)
+        thread = threading.Thread(
+            target=result.run,
+            args=(self._map_batches_shm,
+                  self._handle_batch_ids(batches),
+                  chunksize))
+        thread.daemon = True
+        thread.start()
+        return result
+
+    # Added in 0.5.0.
+    def _map_batches_shm(self, inputs, chunksize):
+        # Equivalent of multiprocessing.Pool.map() for shared memory mode.
+        # All results are received -- also after errors -- so that their
+        # shared memory can be freed. The first error is then re-raised.
+        pool = self.pool
+        if chunksize is None:
+            # same heuristic as in multiprocessing.Pool.map()
+            # pylint: disable=protected-access
+            chunksize, extra = divmod(len(inputs), pool._processes * 4)
+            if extra:
+                chunksize += 1
+            chunksize = max(chunksize, 1)
+
+        output_buffer_left = _create_output_buffer_left(
+            self._shm_ring.nb_slabs)
+        gen = pool.imap(
             _Pool_starworker,
-            self._handle_batch_ids(batches),
-            chunksize=chunksize,
-            callback=callback,
-            error_callback=error_callback)
+            self._shm_send_gen(
+                self._ibuffer_batch_loading(iter(inputs), output_buffer_left)
+            ),
+            chunksize=chunksize)
+
+        batches_aug = []
+        error = None
+        for batch_idx, _batch in inputs:
+            try:
+                batch_aug = self._shm_receive(next(gen))
+            except Exception as exc:  # pylint: disable=broad-except
+                error = exc if error is None else error
+                batch_aug = None
+                self._shm_discard(batch_idx)
+            batches_aug.append(batch_aug)
+            output_buffer_left.release()
+
+        if error is not None:
+            raise error
+        return batches_aug
 
     @classmethod
     def _assert_batches_is_list(cls, batches):
@@ -321,6 +448,8 @@ class Pool(object):
             The buffer is unlimited if this is set to ``None``. For large
             datasets, this should be set to an integer value to avoid filling
             the whole RAM if loading+augmentation happens faster than training.
+            If the pool uses shared memory, ``None`` is treated as ``2*P``
+            with ``P`` being the number of processes.
 
             *New in version 0.3.0.*
 
@@ -332,20 +461,26 @@ class Pool(object):
         """
         self._assert_batches_is_generator(batches)
 
+        pool = self.pool
+        if self.use_shared_memory and output_buffer_size is None:
+            output_buffer_size = self._shm_ring.nb_slabs
+
         # buffer is either None or a Semaphore
         output_buffer_left = _create_output_buffer_left(output_buffer_size)
 
         # TODO change this to 'yield from' once switched to 3.3+
-        gen = self.pool.imap(
+        gen = pool.imap(
             _Pool_starworker,
-            self._ibuffer_batch_loading(
-                self._handle_batch_ids_gen(batches),
-                output_buffer_left
+            self._shm_send_gen(
+                self._ibuffer_batch_loading(
+                    self._handle_batch_ids_gen(batches),
+                    output_buffer_left
+                )
             ),
             chunksize=chunksize)
 
         for batch in gen:
-            yield batch
+            yield self._shm_receive(batch)
             if output_buffer_left is not None:
                 output_buffer_left.release()
 
@@ -375,6 +510,8 @@ class Pool(object):
             The buffer is unlimited if this is set to ``None``. For large
             datasets, this should be set to an integer value to avoid filling
             the whole RAM if loading+augmentation happens faster than training.
+            If the pool uses shared memory, ``None`` is treated as ``2*P``
+            with ``P`` being the number of processes.
 
             *New in version 0.3.0.*
 
@@ -386,20 +523,26 @@ class Pool(object):
         """
         self._assert_batches_is_generator(batches)
 
+        pool = self.pool
+        if self.use_shared_memory and output_buffer_size is None:
+            output_buffer_size = self._shm_ring.nb_slabs
+
         # buffer is either None or a Semaphore
         output_buffer_left = _create_output_buffer_left(output_buffer_size)
 
-        gen = self.pool.imap_unordered(
+        gen = pool.imap_unordered(
             _Pool_starworker,
-            self._ibuffer_batch_loading(
-                self._handle_batch_ids_gen(batches),
-                output_buffer_left
+            self._shm_send_gen(
+                self._ibuffer_batch_loading(
+                    self._handle_batch_ids_gen(batches),
+                    output_buffer_left
+                )
             ),
             chunksize=chunksize
         )
 
         for batch in gen:
-            yield batch
+            yield self._shm_receive(batch)
             if output_buffer_left is not None:
                 output_buffer_left.release()
 
@@ -424,6 +567,7 @@ class Pool(object):
             self._pool.close()
             self._pool.join()
             self._pool = None
+        self._close_shm_ring()
 
     def terminate(self):
         """Terminate the pool immediately."""
@@ -431,6 +575,19 @@ class Pool(object):
             self._pool.terminate()
             self._pool.join()
             self._pool = None
+        self._close_shm_ring()
+
+    # Added in 0.5.0.
+    def _close_shm_ring(self):
+        # Workers have finished (or were killed) at this point, so the
+        # results of all pending batches were either never created or will
+        # never be received.
+        for batch_idx in list(self._shm_pending.keys()):
+            _unlink_shared_memory_if_exists(self._shm_result_name(batch_idx))
+        self._shm_pending = {}
+        if self._shm_ring is not None:
+            self._shm_ring.close()
+            self._shm_ring = None
 
     # TODO why does this function exist if it may only be called after
     #      close/terminate and both of these two already call join() themselves
@@ -465,6 +622,57 @@ class Pool(object):
                 output_buffer_left.acquire()
             yield batch
 
+    # Added in 0.5.0.
+    def _shm_send(self, inputs):
+        # Moves the arrays of a (batch_idx, batch) tuple into shared memory
+        # if use_shared_memory is active. The returned tuple is sent to the
+        # workers instead of the original one.
+        if not self.use_shared_memory:
+            return inputs
+
+        batch_idx, batch = inputs
+        packer = _SharedMemoryBatchPacker()
+        batch_packed = packer.pack_batch(batch, "_unaug")
+        slab = self._shm_ring.acquire(packer.nbytes)
+        packer.write_to(slab.buf)
+        self._shm_pending[batch_idx] = (batch, slab)
+        return batch_idx, _SharedMemoryBatch(
+            batch_idx, slab.name, batch_packed,
+            result_name=self._shm_result_name(batch_idx))
+
+    # Added in 0.5.0.
+    def _shm_send_gen(self, inputs_gen):
+        for inputs in inputs_gen:
+            yield self._shm_send(inputs)
+
+    # Added in 0.5.0.
+    def _shm_receive(self, batch_aug):
+        # Inverse of _shm_send() for the batches returned by the workers.
+        if not isinstance(batch_aug, _SharedMemoryBatch):
+            return batch_aug
+
+        batch_orig, slab = self._shm_pending.pop(batch_aug.batch_idx)
+        result = batch_aug.unpack_and_unlink()
+        for name in _AUGMENTABLE_NAMES:
+            attr_name = name + "_unaug"
+            setattr(result, attr_name, getattr(batch_orig, attr_name))
+        self._shm_ring.release(slab)
+        return result
+
+    # Added in 0.5.0.
+    def _shm_discard(self, batch_idx):
+        # Free the shared memory of a batch whose augmentation failed.
+        # Must only be called once the worker is done with the batch.
+        _batch_orig, slab = self._shm_pending.pop(batch_idx)
+        _unlink_shared_memory_if_exists(self._shm_result_name(batch_idx))
+        self._shm_ring.release(slab)
+
+    # Added in 0.5.0.
+    def _shm_result_name(self, batch_idx):
+        # POSIX shared memory names are limited to 31 characters on some
+        # systems.
+        return "%s_%x" % (self._shm_result_prefix, int(batch_idx))
+
 
 def _create_output_buffer_left(output_buffer_size):
     output_buffer_left = None
@@ -516,10 +724,11 @@ def _Pool_worker(batch_idx, batch):
         "Expected `batch_idx` to be an integer. Got type %s instead." % (
             type(batch_idx)
         ))
-    assert isinstance(batch, (UnnormalizedBatch, Batch)), (
+    assert isinstance(batch, (UnnormalizedBatch, Batch, _SharedMemoryBatch)), (
         "Expected `batch` to be either an instance of "
         "`imgaug.augmentables.batches.UnnormalizedBatch` or "
-        "`imgaug.augmentables.batches.Batch`. Got type %s instead." % (
+        "`imgaug.augmentables.batches.Batch` or "
+        "`imgaug.multicore._SharedMemoryBatch`. Got type %s instead." % (
             type(batch)
         ))
     assert Pool._WORKER_AUGSEQ is not None, (
@@ -531,6 +740,14 @@ def _Pool_worker(batch_idx, batch):
     if Pool._WORKER_SEED_START is not None:
         seed = Pool._WORKER_SEED_START + batch_idx
         _reseed_global_local(seed, augseq)
+
+    if isinstance(batch, _SharedMemoryBatch):
+        shm = _WORKER_SHM_ATTACHMENTS.attach(batch.shm_name)
+        result_name = batch.result_name
+        batch = batch.unpack(shm.buf, copy=False)
+        result = augseq.augment_batch_(batch)
+        return _SharedMemoryBatch.create(batch_idx, result, result_name)
+
     result = augseq.augment_batch_(batch)
     return result
 
@@ -558,6 +775,353 @@ def _derive_seed(base_seed, offset=0):
     )
 
 
+# Description of an array stored in a shared memory block.
+# Added in 0.5.0.
+_SharedArrayRef = collections.namedtuple(
+    "_SharedArrayRef", ["offset", "shape", "dtype"])
+
+
+# Added in 0.5.0.
+class _SharedMemoryBatchPacker(object):
+    """Replace arrays in a batch by references into a shared memory block.
+
+    Only images, heatmaps and segmentation maps are packed, as only these
+    are expected to be large. All other columns are left unchanged and
+    will be pickled.
+
+    """
+
+    # byte alignment of each array within the shared memory block
+    ALIGNMENT = 64
+
+    def __init__(self):
+        self.arrays = []
+        self.nbytes = 0
+
+    def pack_batch(self, batch, postfix):
+        """Create a shallow copy of a batch with packed array columns."""
+        batch_packed = copy_module.copy(batch)
+        for name in ["images", "heatmaps", "segmentation_maps"]:
+            attr_name = name + postfix
+            value = getattr(batch, attr_name)
+            if value is not None:
+                setattr(batch_packed, attr_name, self._pack_value(value))
+        return batch_packed
+
+    def write_to(self, buf):
+        """Copy all arrays that were packed so far into a buffer."""
+        for ref, arr in self.arrays:
+            view = np.ndarray(ref.shape, dtype=ref.dtype, buffer=buf,
+                              offset=ref.offset)
+            view[...] = arr
+            del view
+
+    def _pack_value(self, value):
+        if ia.is_np_array(value):
+            if value.dtype.kind == "O":
+                return value
+            return self._add_array(value)
+        if isinstance(value, HeatmapsOnImage):
+            value = copy_module.copy(value)
+            value.arr_0to1 = self._add_array(value.arr_0to1)
+            return value
+        if isinstance(value, SegmentationMapsOnImage):
+            value = copy_module.copy(value)
+            value.arr = self._add_array(value.arr)
+            return value
+        if isinstance(value, list):
+            return [self._pack_value(item) for item in value]
+        return value
+
+    def _add_array(self, arr):
+        offset = self.nbytes
+        ref = _SharedArrayRef(offset, arr.shape, arr.dtype.str)
+        self.arrays.append((ref, arr))
+        self.nbytes = offset + _round_up(arr.nbytes, self.ALIGNMENT)
+        return ref
+
+
+# Added in 0.5.0.
+def _unpack_shared_value(value, buf, copy):
+    if isinstance(value, _SharedArrayRef):
+        view = np.ndarray(value.shape, dtype=np.dtype(value.dtype),
+                          buffer=buf, offset=value.offset)
+        return np.array(view) if copy else view
+    if isinstance(value, HeatmapsOnImage):
+        value = copy_module.copy(value)
+        value.arr_0to1 = _unpack_shared_value(value.arr_0to1, buf, copy)
+    elif isinstance(value, SegmentationMapsOnImage):
+        value = copy_module.copy(value)
+        value.arr = _unpack_shared_value(value.arr, buf, copy)
+    elif isinstance(value, list):
+        return [_unpack_shared_value(item, buf, copy) for item in value]
+    return value
+
+
+# Added in 0.5.0.
+def _round_up(value, multiple):
+    return ((value + multiple - 1) // multiple) * multiple
+
+
+# Added in 0.5.0.
+class _SharedMemoryBatch(object):
+    """Batch that is transferred between processes via shared memory.
+
+    Contains a batch whose image, heatmap and segmentation map arrays were
+    replaced by :class:`_SharedArrayRef` instances, together with the name
+    of the shared memory block containing these arrays. For batches sent
+    to the workers, `result_name` denotes the name of the block that the
+    worker has to create for the augmentation results.
+
+    """
+
+    def __init__(self, batch_idx, shm_name, batch, result_name=None):
+        self.batch_idx = batch_idx
+        self.shm_name = shm_name
+        self.batch = batch
+        self.result_name = result_name
+
+    @classmethod
+    def create(cls, batch_idx, batch_aug, shm_name):
+        """Move the ``*_aug`` arrays of an augmented batch to shared memory.
+
+        The ``*_unaug`` attributes are dropped as the main process still
+        has them. The new shared memory block is named `shm_name` and has
+        to be unlinked by the receiving process.
+
+        """
+        for name in _AUGMENTABLE_NAMES:
+            setattr(batch_aug, name + "_unaug", None)
+
+        packer = _SharedMemoryBatchPacker()
+        batch_packed = packer.pack_batch(batch_aug, "_aug")
+        shm = _shared_memory.SharedMemory(name=shm_name, create=True,
+                                          size=max(packer.nbytes, 1))
+        packer.write_to(shm.buf)
+        _close_result_shared_memory(shm)
+        return cls(batch_idx, shm.name, batch_packed)
+
+    def unpack(self, buf, copy):
+        """Create a copy of the batch with the packed arrays restored.
+
+        If `copy` is ``False``, the arrays will be views into `buf`.
+        The batch contained in this instance is not changed.
+
+        """
+        batch = copy_module.copy(self.batch)
+        for postfix in ["_unaug", "_aug"]:
+            for name in ["images", "heatmaps", "segmentation_maps"]:
+                attr_name = name + postfix
+                value = getattr(batch, attr_name)
+                if value is not None:
+                    setattr(batch, attr_name,
+                            _unpack_shared_value(value, buf, copy))
+        return batch
+
+    def unpack_and_unlink(self):
+        """Copy the arrays out of this batch's shared memory block.
+
+        The block is unlinked afterwards.
+
+        """
+        shm = _shared_memory.SharedMemory(name=self.shm_name)
+        try:
+            batch = self.unpack(shm.buf, copy=True)
+        finally:
+            _destroy_shared_memory(shm)
+        return batch
+
+
+# Added in 0.5.0.
+class _SharedMemoryMapResult(object):
+    """Result of ``Pool.map_batches_async()`` in shared memory mode.
+
+    Offers the same methods as ``multiprocessing.pool.MapResult``. The
+    batches are augmented via :func:`_SharedMemoryMapResult.run`, which is
+    executed in a separate thread.
+
+    """
+
+    def __init__(self, callback, error_callback):
+        self.callback = callback
+        self.error_callback = error_callback
+        self._event = threading.Event()
+        self._success = None
+        self._value = None
+
+    def run(self, func, *args):
+        """Call `func` and store its result or error."""
+        try:
+            self._value = func(*args)
+            self._success = True
+        except Exception as exc:  # pylint: disable=broad-except
+            self._value = exc
+            self._success = False
+
+        if self._success and self.callback is not None:
+            self.callback(self._value)
+        elif not self._success and self.error_callback is not None:
+            self.error_callback(self._value)
+        self._event.set()
+
+    def get(self, timeout=None):
+        """Return the results. See ``multiprocessing.pool.MapResult``."""
+        self.wait(timeout)
+        if not self.ready():
+            raise multiprocessing.TimeoutError
+        if self._success:
+            return self._value
+        raise self._value
+
+    def wait(self, timeout=None):
+        """Wait for the results. See ``multiprocessing.pool.MapResult``."""
+        self._event.wait(timeout)
+
+    def ready(self):
+        """Return whether the call has completed."""
+        return self._event.is_set()
+
+    def successful(self):
+        """Return whether the call completed without raising an exception."""
+        if not self.ready():
+            raise ValueError("{0!r} not ready".format(self))
+        return self._success
+
+
+# Added in 0.5.0.
+class _SharedMemoryRing(object):
+    """Ring of reusable shared memory blocks ("slabs") for batch transfers.
+
+    Slabs are handed out via :func:`_SharedMemoryRing.acquire` and given
+    back via :func:`_SharedMemoryRing.release`. At most `nb_slabs` released
+    slabs are kept for later reuse, all others are unlinked. Acquiring and
+    releasing is thread-safe as ``multiprocessing.Pool`` loads its inputs
+    in a separate thread.
+
+    """
+
+    # Slab sizes are rounded up to this value to increase the probability
+    # of slabs being reusable for batches of slightly different sizes.
+    SLAB_SIZE_MULTIPLE = 2**20
+
+    def __init__(self, nb_slabs):
+        self.nb_slabs = max(nb_slabs, 1)
+        self._free = []
+        self._in_use = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, nbytes):
+        """Get a slab with a size of at least `nbytes` bytes."""
+        with self._lock:
+            fitting = [slab for slab in self._free if slab.size >= nbytes]
+            if fitting:
+                slab = min(fitting, key=lambda slab_i: slab_i.size)
+                self._free.remove(slab)
+            else:
+                if len(self._free) >= self.nb_slabs:
+                    # ring is full with slabs that are too small, replace
+                    # the smallest one
+                    smallest = min(self._free, key=lambda slab_i: slab_i.size)
+                    self._free.remove(smallest)
+                    _destroy_shared_memory(smallest)
+                size = _round_up(max(nbytes, 1), self.SLAB_SIZE_MULTIPLE)
+                slab = _shared_memory.SharedMemory(create=True, size=size)
+            self._in_use[slab.name] = slab
+            return slab
+
+    def release(self, slab):
+        """Give a slab back to the ring so that it can be reused."""
+        with self._lock:
+            del self._in_use[slab.name]
+            if len(self._free) < self.nb_slabs:
+                self._free.append(slab)
+            else:
+                _destroy_shared_memory(slab)
+
+    def close(self):
+        """Unlink all slabs, including the ones that are still in use."""
+        with self._lock:
+            for slab in self._free + list(self._in_use.values()):
+                _destroy_shared_memory(slab)
+            self._free = []
+            self._in_use = {}
+
+
+# Added in 0.5.0.
+class _SharedMemoryAttachments(object):
+    """Bounded cache of input slabs that a worker has opened.
+
+    Workers receive batches in slabs that are reused by the main process,
+    hence caching the opened slabs avoids re-opening them for each batch.
+    Blocks created by the workers for their results are not cached.
+
+    """
+
+    def __init__(self, max_size=8):
+        self.max_size = max_size
+        self._blocks = collections.OrderedDict()
+
+    def attach(self, name):
+        """Get an opened shared memory block by its name."""
+        shm = self._blocks.pop(name, None)
+        if shm is None:
+            shm = _shared_memory.SharedMemory(name=name)
+        self._blocks[name] = shm
+        self._evict()
+        return shm
+
+    def _evict(self):
+        while len(self._blocks) > self.max_size:
+            _, shm = self._blocks.popitem(last=False)
+            try:
+                shm.close()
+            except BufferError:
+                # arrays still point into the block, it will be closed
+                # once these are garbage collected
+                pass
+
+
+# Added in 0.5.0.
+def _destroy_shared_memory(shm):
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+# Added in 0.5.0.
+def _unlink_shared_memory_if_exists(name):
+    try:
+        shm = _shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    _destroy_shared_memory(shm)
+
+
+# Added in 0.5.0.
+def _close_result_shared_memory(shm):
+    # On POSIX systems, a block persists until it is unlinked, so the worker
+    # can unmap its result block right away. On Windows, a block is
+    # destroyed once its last handle is closed, hence a few result blocks
+    # are kept open until the main process has likely opened them.
+    if os.name == "nt":
+        _WORKER_SHM_RESULTS_NT.append(shm)
+        while len(_WORKER_SHM_RESULTS_NT) > 8:
+            _WORKER_SHM_RESULTS_NT.pop(0).close()
+    else:
+        shm.close()
+
+
+# Input slabs that the current worker process has opened.
+# Added in 0.5.0.
+_WORKER_SHM_ATTACHMENTS = _SharedMemoryAttachments()
+
+# Result blocks that the current worker process keeps open (Windows only).
+# Added in 0.5.0.
+_WORKER_SHM_RESULTS_NT = []
+
+
 class BatchLoader(object):
     """**Deprecated**. Load batches in the background.
 
@@ -1,5 +1,6 @@
 from __future__ import print_function, division, absolute_import
 
+import os
 import time
 import multiprocessing
 import pickle
@@ -665,6 +666,265 @@ class TestPool(unittest.TestCase):
         assert mock_pool.join.call_count == 1
 
 
+# ---------
+# functions used in TestPoolWithSharedMemory, defined outside of the test
+# so that they can be pickled in spawn mode
+def _raise_if_image_is_marked(images, random_state, parents, hooks):
+    for image in images:
+        if image.flat[0] == 255:
+            raise ValueError("marked image")
+    return images
+
+
+def _list_shared_memory_blocks():
+    return set([
+        name for name in os.listdir("/dev/shm")
+        if name.startswith("psm_") or name.startswith("iaa")])
+# ---------
+
+
+@unittest.skipIf(multicore._shared_memory is None,
+                 "shared memory is only supported in python 3.8+")
+class TestPoolWithSharedMemory(unittest.TestCase):
+    def setUp(self):
+        reseed()
+
+    @classmethod
+    def _create_batches(cls, clazz, nb_batches):
+        rng = iarandom.RNG(0)
+        image = rng.integers(0, 255, size=(32, 32, 3)).astype(np.uint8)
+        heatmap = ia.HeatmapsOnImage(
+            rng.random(size=(32, 32, 1)).astype(np.float32),
+            shape=image.shape)
+        segmap = ia.SegmentationMapsOnImage(
+            rng.integers(0, 5, size=(32, 32)).astype(np.int32),
+            shape=image.shape)
+        kpsoi = ia.KeypointsOnImage([ia.Keypoint(x=1, y=2)],
+                                    shape=image.shape)
+        return [
+            clazz(images=np.uint8([image, image + i]),
+                  heatmaps=[heatmap, heatmap],
+                  segmentation_maps=[segmap, segmap],
+                  keypoints=[kpsoi, kpsoi],
+                  data=i)
+            for i in sm.xrange(nb_batches)]
+
+    @classmethod
+    def _assert_batches_equal(cls, batches_a, batches_b):
+        assert len(batches_a) == len(batches_b)
+        for batch_a, batch_b in zip(batches_a, batches_b):
+            assert batch_a.data == batch_b.data
+            assert np.array_equal(batch_a.images_aug, batch_b.images_aug)
+            for hm_a, hm_b in zip(batch_a.heatmaps_aug,
+                                  batch_b.heatmaps_aug):
+                assert np.allclose(hm_a.arr_0to1, hm_b.arr_0to1)
+            for segmap_a, segmap_b in zip(batch_a.segmentation_maps_aug,
+                                          batch_b.segmentation_maps_aug):
+                assert np.array_equal(segmap_a.arr, segmap_b.arr)
+            for kpsoi_a, kpsoi_b in zip(batch_a.keypoints_aug,
+                                        batch_b.keypoints_aug):
+                assert np.allclose(kpsoi_a.to_xy_array(),
+                                   kpsoi_b.to_xy_array())
+
+    def _augment(self, use_shared_memory, method, clazz=Batch):
+        augseq = iaa.Sequential([
+            iaa.Affine(rotate=(-20, 20)),
+            iaa.AddElementwise((0, 10))
+        ])
+        batches = self._create_batches(clazz, 6)
+        with multicore.Pool(augseq, processes=2, seed=1,
+                            use_shared_memory=use_shared_memory) as pool:
+            if method == "map_batches":
+                batches_aug = pool.map_batches(batches)
+            elif method == "map_batches_async":
+                batches_aug = pool.map_batches_async(batches).get()
+            elif method == "imap_batches":
+                batches_aug = list(pool.imap_batches(
+                    (batch for batch in batches), output_buffer_size=2))
+            else:
+                batches_aug = list(pool.imap_batches_unordered(
+                    (batch for batch in batches), output_buffer_size=2))
+                batches_aug = sorted(batches_aug,
+                                     key=lambda batch: batch.data)
+        return batches, batches_aug
+
+    def _test_matches_pickle_transport(self, method, clazz=Batch):
+        _, batches_aug_pickle = self._augment(False, method, clazz)
+        batches, batches_aug_shm = self._augment(True, method, clazz)
+
+        self._assert_batches_equal(batches_aug_pickle, batches_aug_shm)
+        for batch, batch_aug in zip(batches, batches_aug_shm):
+            assert batch_aug.images_unaug is batch.images_unaug
+            assert batch_aug.heatmaps_unaug is batch.heatmaps_unaug
+
+    def test_map_batches(self):
+        self._test_matches_pickle_transport("map_batches")
+
+    def test_map_batches_unnormalized_batch(self):
+        self._test_matches_pickle_transport("map_batches",
+                                            UnnormalizedBatch)
+
+    def test_map_batches_async(self):
+        self._test_matches_pickle_transport("map_batches_async")
+
+    def test_map_batches_async_callback(self):
+        batches = self._create_batches(Batch, 2)
+        received = []
+        with multicore.Pool(iaa.Identity(), processes=1,
+                            use_shared_memory=True) as pool:
+            result = pool.map_batches_async(batches,
+                                            callback=received.append)
+            batches_aug = result.get()
+            result.wait()
+            assert result.ready()
+            assert result.successful()
+
+        assert len(received) == 1
+        assert received[0] is batches_aug
+        for batch, batch_aug in zip(batches, batches_aug):
+            assert np.array_equal(batch_aug.images_aug, batch.images_unaug)
+
+    def test_imap_batches(self):
+        self._test_matches_pickle_transport("imap_batches")
+
+    def test_imap_batches_unordered(self):
+        self._test_matches_pickle_transport("imap_batches_unordered")
+
+    def test_slabs_are_reused(self):
+        batches = self._create_batches(Batch, 10)
+        with multicore.Pool(iaa.Identity(), processes=1,
+                            use_shared_memory=True) as pool:
+            _ = list(pool.imap_batches((batch for batch in batches),
+                                       output_buffer_size=1))
+            ring = pool._shm_ring
+            assert len(ring._free) == 1
+            assert len(ring._in_use) == 0
+            assert len(pool._shm_pending) == 0
+
+        assert pool._shm_ring is None
+
+    def test_number_of_slabs_in_use_is_limited(self):
+        batches = self._create_batches(Batch, 10)
+        in_use_counts = []
+        with multicore.Pool(iaa.Identity(), processes=1,
+                            use_shared_memory=True) as pool:
+            for _ in pool.imap_batches((batch for batch in batches)):
+                in_use_counts.append(len(pool._shm_ring._in_use))
+                time.sleep(0.01)
+            nb_slabs = pool._shm_ring.nb_slabs
+
+        assert nb_slabs == 2
+        assert max(in_use_counts) <= nb_slabs
+
+    def _create_batches_with_marked_image(self, nb_batches, marked_idx):
+        batches = self._create_batches(Batch, nb_batches)
+        batches[marked_idx].images_unaug[0].flat[0] = 255
+        return batches
+
+    @unittest.skipUnless(os.path.isdir("/dev/shm"),
+                         "requires /dev/shm")
+    def test_no_shared_memory_leaked_after_error_in_map_batches(self):
+        augseq = iaa.Lambda(func_images=_raise_if_image_is_marked)
+        batches = self._create_batches_with_marked_image(6, 2)
+        blocks_before = _list_shared_memory_blocks()
+
+        with multicore.Pool(augseq, processes=2,
+                            use_shared_memory=True) as pool:
+            with self.assertRaises(ValueError):
+                _ = pool.map_batches(batches)
+            assert len(pool._shm_pending) == 0
+            assert len(pool._shm_ring._in_use) == 0
+
+        assert _list_shared_memory_blocks() == blocks_before
+
+    @unittest.skipUnless(os.path.isdir("/dev/shm"),
+                         "requires /dev/shm")
+    def test_no_shared_memory_leaked_after_error_in_map_batches_async(self):
+        augseq = iaa.Lambda(func_images=_raise_if_image_is_marked)
+        batches = self._create_batches_with_marked_image(6, 2)
+        errors = []
+        blocks_before = _list_shared_memory_blocks()
+
+        with multicore.Pool(augseq, processes=2,
+                            use_shared_memory=True) as pool:
+            result = pool.map_batches_async(batches,
+                                            error_callback=errors.append)
+            with self.assertRaises(ValueError):
+                _ = result.get()
+            assert not result.successful()
+            assert len(pool._shm_pending) == 0
+
+        assert len(errors) == 1
+        assert isinstance(errors[0], ValueError)
+        assert _list_shared_memory_blocks() == blocks_before
+
+    @unittest.skipUnless(os.path.isdir("/dev/shm"),
+                         "requires /dev/shm")
+    def test_no_shared_memory_leaked_after_stopping_imap_batches(self):
+        batches = self._create_batches(Batch, 6)
+        blocks_before = _list_shared_memory_blocks()
+
+        with multicore.Pool(iaa.Identity(), processes=2,
+                            use_shared_memory=True) as pool:
+            for _batch_aug in pool.imap_batches(
+                    (batch for batch in batches)):
+                break
+
+        assert _list_shared_memory_blocks() == blocks_before
+
+
+@unittest.skipIf(multicore._shared_memory is None,
+                 "shared memory is only supported in python 3.8+")
+class Test_SharedMemoryBatch(unittest.TestCase):
+    def test_pack_and_unpack(self):
+        image = np.arange(3*4*3).astype(np.uint8).reshape((3, 4, 3))
+        heatmap = ia.HeatmapsOnImage(
+            np.linspace(0, 1.0, 3*4).astype(np.float32).reshape((3, 4, 1)),
+            shape=(3, 4, 3))
+        batch = UnnormalizedBatch(images=[image, image[0:2]],
+                                  heatmaps=[heatmap],
+                                  keypoints=[(1, 2)])
+        packer = multicore._SharedMemoryBatchPacker()
+        batch_packed = packer.pack_batch(batch, "_unaug")
+        buf = bytearray(packer.nbytes)
+        packer.write_to(buf)
+
+        shm_batch = multicore._SharedMemoryBatch(0, "name", batch_packed)
+        batch_unpacked = shm_batch.unpack(buf, copy=True)
+
+        assert shm_batch.batch is batch_packed
+        assert isinstance(batch_packed.images_unaug[0],
+                          multicore._SharedArrayRef)
+        assert isinstance(batch_packed.heatmaps_unaug[0].arr_0to1,
+                          multicore._SharedArrayRef)
+        assert batch_packed.images_unaug[1].offset % 64 == 0
+        assert batch.heatmaps_unaug[0] is heatmap
+        assert np.array_equal(batch_unpacked.images_unaug[0], image)
+        assert np.array_equal(batch_unpacked.images_unaug[1], image[0:2])
+        assert np.allclose(batch_unpacked.heatmaps_unaug[0].arr_0to1,
+                           heatmap.arr_0to1)
+        assert batch_unpacked.keypoints_unaug == [(1, 2)]
+
+    def test_ring_acquire_and_release(self):
+        ring = multicore._SharedMemoryRing(nb_slabs=1)
+        try:
+            slab1 = ring.acquire(10)
+            slab2 = ring.acquire(10)
+            assert slab1.name != slab2.name
+            assert slab1.size >= 10
+
+            ring.release(slab1)
+            ring.release(slab2)
+            assert len(ring._free) == 1
+
+            slab3 = ring.acquire(5)
+            assert slab3.name == slab1.name
+        finally:
+            ring.close()
+        assert len(ring._free) == 0
+        assert len(ring._in_use) == 0
+
+
 # This should already be part of the Pool tests, but according to codecov
 # it is not tested. Likely some travis error related to running multiple
 # python processes.